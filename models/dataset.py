@@ -1,17 +1,29 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import cached_property
+from typing import Iterable, Optional, Tuple
 
-@dataclass
+@dataclass(frozen=True)
 class Dataset:
-    """Represents a DCAT dataset with its metadata."""
-    dataset_id: str
-    titles: List[str]
-    descriptions: List[str]
-    keywords: List[str]
-    access_urls: List[str]
-    download_urls: List[str]
-
-    @property
+    """
+    Represents a DCAT dataset with its metadata.
+
+    Instances are immutable (list fields are stored as tuples), so derived values such as
+    the content string are computed once and cached.
+    """
+    dataset_id: Optional[str]
+    titles: Tuple[str, ...]
+    descriptions: Tuple[str, ...]
+    keywords: Tuple[str, ...]
+    access_urls: Tuple[str, ...]
+    download_urls: Tuple[str, ...]
+
+    def __post_init__(self):
+        # accept any iterable, e.g. the lists built by the parsers, and freeze it
+        for name in ("titles", "descriptions", "keywords", "access_urls", "download_urls"):
+            values: Iterable[str] = getattr(self, name)
+            object.__setattr__(self, name, tuple(values))
+
+    @cached_property
     def primary_title(self) -> Optional[str]:
         """
         DCAT Datasets may contain multiple titles in different languages. 
@@ -19,20 +31,24 @@ class Dataset:
         """
         return self.titles[0] if self.titles else None
     
-    def to_content(self) -> str:
+    @cached_property
+    def content(self) -> str:
         """
         Combines the dataset's metadata into a single text chunk. This is useful for embedding and searching.
         """
 
-        content_parts = []
-        if self.titles:
-            content_parts.append(f"Title: {'; '.join(self.titles)}")
-        if self.descriptions:
-            content_parts.append(f"Description: {'; '.join(self.descriptions)}")
-        if self.keywords:
-            content_parts.append(f"Keywords: {', '.join(self.keywords)}")
+        fields = (
+            ("Title", "; ", self.titles),
+            ("Description", "; ", self.descriptions),
+            ("Keywords", ", ", self.keywords),
+        )
+        return "\n".join([f"{label}: {separator.join(values)}" for label, separator, values in fields if values])
 
-        return "\n".join(content_parts)
+    def to_content(self) -> str:
+        """
+        Returns the combined text chunk of the dataset's metadata, see `content`.
+        """
+        return self.content
 
     def to_metadata(self) -> dict:
         """
@@ -41,7 +57,7 @@ class Dataset:
         return {
             "dataset_id": self.dataset_id,
             "title": self.primary_title,
-            "keywords": self.keywords
+            "keywords": list(self.keywords)
         }
 
         
\ No newline at end of file
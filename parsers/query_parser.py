@@ -1,10 +1,15 @@
+import hashlib
 import logging
+import os
+import threading
+from collections import OrderedDict
 from typing import List, Optional
 from dataclasses import dataclass
 
+from langchain.globals import set_llm_cache
+from langchain_community.cache import SQLiteCache
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
-from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field, validator
 from dotenv import load_dotenv
 
@@ -14,11 +19,21 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# parsed intents shared by all QueryParser instances, so parse_query() benefits as well
+INTENT_CACHE_SIZE = 256
+_intent_cache: "OrderedDict[str, str]" = OrderedDict()
+_intent_cache_lock = threading.Lock()
+
+# persistent LangChain cache for LLM responses, shared across processes and by every chain
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".langchain.db")
+set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+
 @dataclass
 class Config:
     """Configuration for the query parser."""
     model_name: str = "gpt-4o-mini"
-    temperature: float = 0.5
+    temperature: float = 0.0
+    use_cache: bool = True  # only takes effect at temperature 0, where answers are deterministic
 
 
 class QueryIntent(BaseModel):
@@ -40,27 +55,26 @@ class QueryIntent(BaseModel):
 class QueryParser:
     """ Parser for extracting structured query intent from natural language queries."""
 
-    SYSTEM_PROMPT = "You are a geospatial query specialist"
-    USER_PROMPT = """
-    Your task is to extract from this dataset search query:
+    # Everything static lives in the system message so it forms an identical prompt
+    # prefix across calls, which OpenAI's automatic prompt caching can reuse.
+    SYSTEM_PROMPT = """
+    You are a geospatial query specialist.
+    Your task is to extract from the user's dataset search query:
         1. raw_theme: Raw theme or core search theme (exact user wording)
         2. locations: Place names for that will be used later for geocoding. A location can be a town, city, country or region which can be geocoded using a geocoding API.
         3. themes: Main themes, keywords and topics that are relevant to the query. Where possible, add two themes that match the user query
         4. publishers: Organizations or data publishers mentioned
-    Format your response as a JSON that matches this pydantic schema:
-    {format_instructions}
-
-    Query: {query}
     """
+    USER_PROMPT = "Query: {query}"
 
     def __init__(self, config: Optional[Config] = None):
         """Initialize the parser."""
         self.config = config or Config()
         self.model = ChatOpenAI(
             model_name=self.config.model_name,
-            temperature=self.config.temperature
+            temperature=self.config.temperature,
+            cache=self.config.use_cache and self.config.temperature == 0,
         )
-        self.parser = PydanticOutputParser(pydantic_object=QueryIntent)
 
         self.prompt = ChatPromptTemplate.from_messages(
             [
@@ -69,7 +83,9 @@ class QueryParser:
             ]
         )
 
-        self.chain = self.prompt | self.model | self.parser
+        # OpenAI's structured outputs constrain the response to the QueryIntent JSON schema,
+        # so the prompt needs no format instructions and the reply is always valid JSON
+        self.chain = self.prompt | self.model.with_structured_output(QueryIntent, method="json_schema")
 
     def parse(self, query:str) -> QueryIntent:
         """Parse a natural language query into a structured intent."""
@@ -77,15 +93,49 @@ class QueryParser:
         if not query or not query.strip():
             raise ValueError("Query cannot be empty")
         
+        use_cache = self.config.use_cache and self.config.temperature == 0
+        cache_key = self._cache_key(query)
+        cached = self._lookup_in_cache(cache_key) if use_cache else None
+        if cached is not None:
+            logger.info(f"Cache hit for query: {query}")
+            return QueryIntent.model_validate_json(cached)
+
         try:
-            logger.info("Parsing query: {query}")
-            result = self.chain.invoke({"query": query, "format_instructions": self.parser.get_format_instructions()})
-            logger.info("Successfully parsed: {result.raw_theme}")
-            return result
+            logger.info(f"Parsing query: {query}")
+            result = self.chain.invoke({"query": query})
+            logger.info(f"Successfully parsed: {result.raw_theme}")
         except Exception as e:
             logger.error(f"Failed to parse query: {e}")
             raise
 
+        if use_cache:
+            self._store_in_cache(cache_key, result)
+        return result
+
+    def _cache_key(self, query: str) -> str:
+        """Build a cache key from the model settings and the normalized query."""
+        normalized = " ".join(query.lower().split())
+        key = f"{self.config.model_name}\x00{self.config.temperature}\x00{normalized}"
+        return hashlib.blake2b(key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _lookup_in_cache(cache_key: str) -> Optional[str]:
+        """Return a cached intent and mark it as most recently used."""
+        with _intent_cache_lock:
+            cached = _intent_cache.get(cache_key)
+            if cached is not None:
+                _intent_cache.move_to_end(cache_key)
+            return cached
+
+    @staticmethod
+    def _store_in_cache(cache_key: str, result: QueryIntent) -> None:
+        """Store a parsed intent, evicting the least recently used entry when the cache is full."""
+        with _intent_cache_lock:
+            _intent_cache[cache_key] = result.model_dump_json()
+            _intent_cache.move_to_end(cache_key)
+            while len(_intent_cache) > INTENT_CACHE_SIZE:
+                _intent_cache.popitem(last=False)
+
 def parse_query(query: str, config: Optional[Config] = None) -> QueryIntent:
     """Convenience function to parse a query using the default configuration."""
     parser = QueryParser(config)
@@ -1,60 +1,358 @@
-from typing import List
-from rdflib import Graph, Namespace, RDF
+import re
+from collections import defaultdict
+from copy import copy
+from itertools import count
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+from lxml import etree
+from rdflib import Graph, RDF, URIRef
+from rdflib.util import guess_format
 from models.dataset import Dataset
 
+try:
+    import oxrdflib  # registers the Rust-backed "Oxigraph" store and "ox-*" parsers with rdflib
+except ImportError:
+    oxrdflib = None
+
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+DCAT_NS = "http://www.w3.org/ns/dcat#"
+DCT_NS = "http://purl.org/dc/terms/"
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+
+# element and attribute names in lxml's {namespace}local notation
+RDF_RDF = f"{{{RDF_NS}}}RDF"
+RDF_ABOUT = f"{{{RDF_NS}}}about"
+RDF_ID = f"{{{RDF_NS}}}ID"
+RDF_NODE_ID = f"{{{RDF_NS}}}nodeID"
+RDF_RESOURCE = f"{{{RDF_NS}}}resource"
+RDF_DATATYPE = f"{{{RDF_NS}}}datatype"
+RDF_PARSE_TYPE = f"{{{RDF_NS}}}parseType"
+RDF_TYPE = f"{{{RDF_NS}}}type"
+RDF_DESCRIPTION = f"{{{RDF_NS}}}Description"
+XML_LANG = f"{{{XML_NS}}}lang"
+DCAT_DISTRIBUTION_PROPERTY = f"{{{DCAT_NS}}}distribution"
+DCAT_KEYWORD = f"{{{DCAT_NS}}}keyword"
+DCAT_ACCESS_URL = f"{{{DCAT_NS}}}accessURL"
+DCAT_DOWNLOAD_URL = f"{{{DCAT_NS}}}downloadURL"
+DCT_TITLE = f"{{{DCT_NS}}}title"
+DCT_DESCRIPTION = f"{{{DCT_NS}}}description"
+DCT_IDENTIFIER = f"{{{DCT_NS}}}identifier"
+DCAT_DATASET_TYPE = f"{DCAT_NS}Dataset"
+
+# the same terms as rdflib URIRefs for the graph-based extractor, built once instead of on
+# every Namespace attribute access
+DCAT_DATASET_URI = URIRef(DCAT_DATASET_TYPE)
+DCAT_DISTRIBUTION_URI = URIRef(f"{DCAT_NS}distribution")
+DCAT_KEYWORD_URI = URIRef(f"{DCAT_NS}keyword")
+DCAT_ACCESS_URL_URI = URIRef(f"{DCAT_NS}accessURL")
+DCAT_DOWNLOAD_URL_URI = URIRef(f"{DCAT_NS}downloadURL")
+DCT_TITLE_URI = URIRef(f"{DCT_NS}title")
+DCT_DESCRIPTION_URI = URIRef(f"{DCT_NS}description")
+DCT_IDENTIFIER_URI = URIRef(f"{DCT_NS}identifier")
+
+# the predicates the streaming extractor keeps, everything else is skipped
+STREAMED_PREDICATES = {
+    DCT_TITLE, DCT_DESCRIPTION, DCT_IDENTIFIER, DCAT_KEYWORD,
+    DCAT_DISTRIBUTION_PROPERTY, DCAT_ACCESS_URL, DCAT_DOWNLOAD_URL,
+}
+
+# RDF/XML grammar: the role an element plays, derived from its parent's role
+ROOT, NODE, PROPERTY, RESOURCE_PROPERTY, COLLECTION_PROPERTY, LITERAL = range(6)
+PARSE_TYPE_ROLES = {"Resource": RESOURCE_PROPERTY, "Collection": COLLECTION_PROPERTY, "Literal": LITERAL}
+
+# URI references that start with a scheme are absolute (at least two characters, so that
+# Windows drive letters are not mistaken for one)
+ABSOLUTE_URI = re.compile(r"[A-Za-z][A-Za-z0-9+.-]+:")
+
+# rdflib formats that oxrdflib can parse natively as "ox-<format>"
+OXIGRAPH_FORMATS = {"turtle", "xml", "n3", "nt", "nquads", "trig", "json-ld"}
+
+# subject -> predicate -> ordered set of (value, language) objects
+Statements = Dict[str, Dict[str, Dict[Tuple[str, Optional[str]], None]]]
+
 
 class RDFParser:
     """Parses RDF files to extract DCAT datasets and their metadata."""
 
-    def __init__(self):
-        self.dcat = Namespace("http://www.w3.org/ns/dcat#")
-        self.dct = Namespace("http://purl.org/dc/terms/")
-        self.foaf = Namespace("http://xmlns.com/foaf/0.1/")
-
-    def parse_file(self, file_path: str) -> List[Dataset]:
+    def parse_file(self, file_path: str) -> Iterator[Dataset]:
         """
-        Parses RDF files and return a list of Dataset objects
+        Parses RDF files and yields Dataset objects.
+
+        RDF/XML files, and files whose format cannot be guessed from the extension, are read in
+        a single streaming pass with lxml. Other serializations (Turtle, JSON-LD, N-Triples, ...)
+        are loaded into an rdflib graph.
         """
 
+        if guess_format(str(file_path)) in (None, "xml"):
+            yield from self._stream_datasets(file_path)
+            return
+
         graph = self._load_graph(file_path)
-        return self._extract_datasets(graph)
-    
+        yield from self._extract_datasets(graph)
+
+    def _stream_datasets(self, file_path: str) -> Iterator[Dataset]:
+        """
+        Extracts all datasets from an RDF/XML file without building an RDF graph.
+
+        Every node element is read when it ends and then dropped from the tree, keeping only the
+        statements needed for Dataset objects. As in an RDF graph, statements about the same subject
+        are merged wherever they appear in the file, so datasets are yielded once the whole file
+        has been read.
+        """
+
+        statements: Statements = defaultdict(lambda: defaultdict(dict))
+        dataset_subjects: Dict[str, None] = {}
+        blank_ids = count()
+        base_uri = Path(file_path).resolve().as_uri()
+        roles = []
+
+        for event, elem in etree.iterparse(str(file_path), events=("start", "end")):
+            if event == "start":
+                roles.append(self._role(roles[-1] if roles else None, elem))
+                continue
+
+            role = roles.pop()
+            if role == NODE:
+                subject = self._subject(elem, base_uri, blank_ids)
+                if self._read_node(elem, subject, statements, base_uri, blank_ids):
+                    dataset_subjects[subject] = None
+                self._release(elem, top_level=bool(roles) and roles[-1] == ROOT)
+            elif role == RESOURCE_PROPERTY:
+                # rdf:parseType="Resource" stands for a blank node whose properties are the children
+                blank_id = f"genid#{next(blank_ids)}"
+                if self._read_properties(elem, f"_:{blank_id}", statements, base_uri, blank_ids):
+                    dataset_subjects[f"_:{blank_id}"] = None
+                del elem[:]
+                del elem.attrib[RDF_PARSE_TYPE]
+                elem.set(RDF_NODE_ID, blank_id)
+
+        for subject in dataset_subjects:
+            yield self._build_dataset(statements, subject)
+
+    @staticmethod
+    def _role(parent_role: Optional[int], elem) -> int:
+        """
+        Returns the RDF/XML role of an element given the role of its parent.
+        """
+
+        if parent_role is None:
+            return ROOT if elem.tag == RDF_RDF else NODE
+        if parent_role in (ROOT, PROPERTY, COLLECTION_PROPERTY):
+            return NODE
+        if parent_role in (NODE, RESOURCE_PROPERTY):
+            return PARSE_TYPE_ROLES.get(elem.get(RDF_PARSE_TYPE), PROPERTY)
+        return LITERAL
+
+    def _read_node(self, elem, subject: str, statements: Statements, base_uri: str, blank_ids) -> bool:
+        """
+        Records the statements of a node element and returns whether it is typed as a dcat:Dataset.
+        """
+
+        is_dataset = elem.tag != RDF_DESCRIPTION and self._expand(elem.tag) == DCAT_DATASET_TYPE
+        if elem.get(RDF_TYPE) is not None:
+            is_dataset |= self._resolve(elem, elem.get(RDF_TYPE), base_uri) == DCAT_DATASET_TYPE
+        self._read_property_attributes(elem, subject, statements)
+        return self._read_properties(elem, subject, statements, base_uri, blank_ids) or is_dataset
+
+    def _read_properties(self, elem, subject: str, statements: Statements, base_uri: str, blank_ids) -> bool:
+        """
+        Records the property elements of a node and returns whether one of them types it as a dcat:Dataset.
+        """
+
+        is_dataset = False
+        for prop in elem.iterchildren(etree.Element):
+            if prop.tag == RDF_TYPE:
+                is_dataset |= self._object(prop, statements, base_uri, blank_ids)[0] == DCAT_DATASET_TYPE
+            elif prop.tag in STREAMED_PREDICATES:
+                statements[subject][prop.tag][self._object(prop, statements, base_uri, blank_ids)] = None
+        return is_dataset
+
+    def _object(self, prop, statements: Statements, base_uri: str, blank_ids) -> Tuple[str, Optional[str]]:
+        """
+        Returns the object of a property element as a (value, language) pair.
+        """
+
+        resource = prop.get(RDF_RESOURCE)
+        node_id = prop.get(RDF_NODE_ID)
+        node = next(prop.iterchildren(etree.Element), None)
+        has_attributes = any(name not in (XML_LANG, RDF_DATATYPE, RDF_ID, RDF_PARSE_TYPE) for name in prop.attrib)
+
+        if prop.get(RDF_PARSE_TYPE) == "Literal":
+            # an XML literal is the element's content as written, like rdflib's XMLLiteral
+            return self._inner_xml(prop), None
+        if resource is not None:
+            value = self._resolve(prop, resource, base_uri)
+        elif node_id is not None:
+            value = f"_:{node_id}"
+        elif node is not None and prop.get(RDF_PARSE_TYPE) is None:
+            # nested node elements are read before their parent and keep their identifying attribute
+            value = self._subject(node, base_uri, blank_ids)
+        elif has_attributes:
+            # property attributes on an empty property element describe a new blank node
+            value = f"_:genid#{next(blank_ids)}"
+        else:
+            return "".join(prop.itertext()), self._language(prop)
+
+        self._read_property_attributes(prop, value, statements)
+        return value, None
+
+    @staticmethod
+    def _inner_xml(elem) -> str:
+        """
+        Serializes the content of an element, declaring only the namespaces each child element uses.
+        """
+
+        parts = [elem.text or ""]
+        for child in elem:
+            child = copy(child)
+            etree.cleanup_namespaces(child)
+            parts.append(etree.tostring(child, encoding="unicode", with_tail=True))
+        return "".join(parts)
+
+    @staticmethod
+    def _read_property_attributes(elem, subject: str, statements: Statements) -> None:
+        """
+        Records property attributes, e.g. <rdf:Description rdf:about="..." dct:title="...">, as literal statements.
+        """
+
+        for name, value in elem.attrib.items():
+            if name in STREAMED_PREDICATES:
+                statements[subject][name][(value, RDFParser._language(elem))] = None
+
+    def _build_dataset(self, statements: Statements, subject: str) -> Dataset:
+        """
+        Builds a Dataset from the statements collected about a subject.
+        """
+
+        objects = statements.get(subject, {})
+
+        def values(properties, predicate: str) -> List[str]:
+            return [value for value, _ in properties.get(predicate, ())]
+
+        access_urls = []
+        download_urls = []
+        for distribution in values(objects, DCAT_DISTRIBUTION_PROPERTY):
+            distribution_objects = statements.get(distribution, {})
+            access_urls.extend(values(distribution_objects, DCAT_ACCESS_URL))
+            download_urls.extend(values(distribution_objects, DCAT_DOWNLOAD_URL))
+
+        identifiers = values(objects, DCT_IDENTIFIER)
+        return Dataset(
+            titles=values(objects, DCT_TITLE),
+            descriptions=values(objects, DCT_DESCRIPTION),
+            keywords=values(objects, DCAT_KEYWORD),
+            access_urls=access_urls,
+            download_urls=download_urls,
+            dataset_id=identifiers[0] if identifiers else None
+        )
+
+    def _subject(self, elem, base_uri: str, blank_ids) -> str:
+        """
+        Returns the URI or blank node id of a node element, assigning a blank node id if it has none.
+        """
+
+        about = elem.get(RDF_ABOUT)
+        if about is not None:
+            return self._resolve(elem, about, base_uri)
+        rdf_id = elem.get(RDF_ID)
+        if rdf_id is not None:
+            return self._resolve(elem, f"#{rdf_id}", base_uri)
+        node_id = elem.get(RDF_NODE_ID)
+        if node_id is None:
+            # "#" cannot occur in an rdf:nodeID, so generated ids never clash with the document's
+            node_id = f"genid#{next(blank_ids)}"
+            elem.set(RDF_NODE_ID, node_id)
+        return f"_:{node_id}"
+
+    @staticmethod
+    def _resolve(elem, uri: str, base_uri: str) -> str:
+        """
+        Resolves a relative URI reference against xml:base or the file location.
+        """
+
+        if ABSOLUTE_URI.match(uri):
+            return uri
+        base = elem.base
+        return urljoin(base if base and ABSOLUTE_URI.match(base) else base_uri, uri)
+
+    @staticmethod
+    def _expand(tag: str) -> str:
+        """
+        Turns an lxml {namespace}local tag into the URI it stands for.
+        """
+
+        namespace, _, local = tag[1:].partition("}")
+        return namespace + local
+
+    @staticmethod
+    def _language(elem) -> Optional[str]:
+        """
+        Returns the xml:lang in scope for an element.
+        """
+
+        while elem is not None:
+            language = elem.get(XML_LANG)
+            if language is not None:
+                return language
+            elem = elem.getparent()
+        return None
+
+    @staticmethod
+    def _release(elem, top_level: bool) -> None:
+        """
+        Drops the children of a node element that has been read, keeping its identifying attributes
+        for the enclosing property. Top-level nodes also drop their already processed preceding
+        siblings, so memory use stays flat while streaming.
+        """
+
+        del elem[:]
+        if top_level:
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
     def _load_graph(self, file_path: str) -> Graph:
         """
         Loads an RDF graph from a file.
+
+        Uses the Oxigraph store and parsers when oxrdflib is installed, and rdflib's
+        in-memory store otherwise.
         """
 
-        graph = Graph()
-        with open(file_path, "r", encoding="utf-8") as f:
-            graph.parse(f, format="application/rdf+xml")
+        rdf_format = guess_format(str(file_path))
+        if oxrdflib is None:
+            graph = Graph()
+        else:
+            graph = Graph(store="Oxigraph")
+            if rdf_format in OXIGRAPH_FORMATS:
+                rdf_format = f"ox-{rdf_format}"
+
+        graph.parse(str(file_path), format=rdf_format)
         return graph
 
-    def _extract_datasets(self, graph: Graph) -> List[Dataset]:
+    def _extract_datasets(self, graph: Graph) -> Iterator[Dataset]:
         """
-        Extracts all datasets from the RDF grapg and returns them as a list of Dataset objects.
+        Extracts all datasets from the RDF graph and yields them as Dataset objects.
         """
 
-        datasets = []
-        dataset_subjects = list(graph.subjects(RDF.type, self.dcat.Dataset))
+        for dataset_uri in graph.subjects(RDF.type, DCAT_DATASET_URI):
+            yield self._extract_single_dataset(graph, dataset_uri)
 
-        for dataset_uri in dataset_subjects:
-            dataset = self._extract_single_dataset(graph, dataset_uri)
-            datasets.append(dataset)
-
-        return datasets
-    
     def _extract_single_dataset(self, graph: Graph, dataset_uri) -> Dataset:
         """
         Extracts a single dataset from the RDF graph and returns it as a Dataset object.
-        """
 
-        titles = [str(title) for title in graph.objects(dataset_uri, self.dct.title)]
-        descriptions = [str(description) for description in graph.objects(dataset_uri, self.dct.description)]
-        keywords = [str(keyword) for keyword in graph.objects(dataset_uri, self.dcat.keyword)]
-        dataset_id = [(str(id) if id else None) for id in graph.objects(dataset_uri, self.dct.identifier)][0]
+        All statements about the dataset are read in one sweep over the graph and grouped by predicate.
+        """
 
-        access_urls, download_urls = self._extract_distribution_urls(graph, dataset_uri)
+        objects = self._objects_by_predicate(graph, dataset_uri)
+        titles = [str(title) for title in objects[DCT_TITLE_URI]]
+        descriptions = [str(description) for description in objects[DCT_DESCRIPTION_URI]]
+        keywords = [str(keyword) for keyword in objects[DCAT_KEYWORD_URI]]
+        identifiers = objects[DCT_IDENTIFIER_URI]
+        dataset_id = str(identifiers[0]) if identifiers else None
 
+        access_urls, download_urls = self._extract_distribution_urls(graph, objects[DCAT_DISTRIBUTION_URI])
 
         return Dataset(
             titles=titles,
@@ -64,18 +362,29 @@ class RDFParser:
             download_urls=download_urls,
             dataset_id=dataset_id
         )
-    
-    def _extract_distribution_urls(self, graph: Graph, dataset_uri) -> tuple[List[str], List[str]]:
+
+    def _extract_distribution_urls(self, graph: Graph, distributions: list) -> tuple[List[str], List[str]]:
         """
         Extracts access and download URLs from the dataset's distributions.
         """
 
-        distributions = list(graph.objects(dataset_uri, self.dcat.distribution))
         access_urls = []
         download_urls = []
 
         for distribution in distributions:
-            access_urls.extend([str(url) for url in graph.objects(distribution, self.dcat.accessURL)])
-            download_urls.extend([str(url) for url in graph.objects(distribution, self.dcat.downloadURL)])
+            objects = self._objects_by_predicate(graph, distribution)
+            access_urls.extend([str(url) for url in objects[DCAT_ACCESS_URL_URI]])
+            download_urls.extend([str(url) for url in objects[DCAT_DOWNLOAD_URL_URI]])
+
+        return access_urls, download_urls
+
+    @staticmethod
+    def _objects_by_predicate(graph: Graph, subject) -> defaultdict:
+        """
+        Returns the objects of all statements about `subject`, grouped by predicate.
+        """
 
-        return access_urls, download_urls
\ No newline at end of file
+        objects = defaultdict(list)
+        for _, predicate, obj in graph.triples((subject, None, None)):
+            objects[predicate].append(obj)
+        return objects
@@ -4,7 +4,6 @@ from dataclasses import dataclass
 
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
-from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field, validator
 from dotenv import load_dotenv
 
@@ -15,7 +14,7 @@ logger = logging.getLogger(__name__)
 @dataclass
 class Config:
     """Configuration for the query parser."""
-    model_name: str = "gpt-3.5-turbo"
+    model_name: str = "gpt-4o-mini"
     temperature: float = 0.0
 
 
@@ -45,8 +44,6 @@ class QueryParser:
         2. locations: Place names for that will be used later for geocoding. A location can be a town, city, country or region which can be geocoded using a geocoding API.
         3. themes: Main themes, keywords and topics that are relevant to the query. Where possible, add two themes that match the user query
         4. publishers: Organizations or data publishers mentioned
-    Format your response as a JSON that matches this pydantic schema:
-    {format_instructions}
 
     Query: {query}
     """
@@ -58,7 +55,6 @@ class QueryParser:
             model_name=self.config.model_name,
             temperature=self.config.temperature
         )
-        self.parser = PydanticOutputParser(pydantic_object=QueryIntent)
 
         self.prompt = ChatPromptTemplate.from_messages(
             [
@@ -67,7 +63,7 @@ class QueryParser:
             ]
         )
 
-        self.chain = self.prompt | self.model | self.parser
+        self.chain = self.prompt | self.model.with_structured_output(QueryIntent, method="json_schema")
 
     def parse(self, query:str) -> QueryIntent:
         """Parse a natural language query into a structured intent."""
@@ -77,7 +73,7 @@ class QueryParser:
         
         try:
             logger.info("Parsing query: {query}")
-            result = self.chain.invoke({"query": query, "format_instructions": self.parser.get_format_instructions()})
+            result = self.chain.invoke({"query": query})
             logger.info("Successfully parsed: {result.raw_theme}")
             return result
         except Exception as e:
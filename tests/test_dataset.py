@@ -0,0 +1,37 @@
+import dataclasses
+
+import pytest
+
+from models.dataset import Dataset
+
+
+def _dataset(**overrides):
+    fields = dict(
+        dataset_id="id-1",
+        titles=["Radwege", "Cycle paths"],
+        descriptions=["Radwegenetz der Stadt"],
+        keywords=["verkehr", "rad"],
+        access_urls=["http://ex/access"],
+        download_urls=[],
+    )
+    fields.update(overrides)
+    return Dataset(**fields)
+
+
+def test_content_joins_non_empty_fields():
+    assert _dataset(descriptions=[]).content == "Title: Radwege; Cycle paths\nKeywords: verkehr, rad"
+
+
+def test_list_fields_are_frozen():
+    dataset = _dataset()
+
+    assert dataset.titles == ("Radwege", "Cycle paths")
+    with pytest.raises(AttributeError):
+        dataset.titles.append("X")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        dataset.titles = ("X",)
+
+
+def test_metadata_uses_primary_title():
+    assert _dataset().to_metadata() == {"dataset_id": "id-1", "title": "Radwege", "keywords": ["verkehr", "rad"]}
+    assert _dataset(titles=[]).primary_title is None
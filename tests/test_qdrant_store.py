@@ -0,0 +1,200 @@
+import asyncio
+from typing import Optional
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_qdrant import QdrantVectorStore
+from qdrant_client import QdrantClient
+
+from models.dataset import Dataset
+from vector_stores import qdrant_store
+from vector_stores.qdrant_store import QdrantVectorStoreManager, point_id
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    """Deterministic embeddings that record how many texts were sent for embedding."""
+
+    model: str = "fake-embedding"
+    dimensions: Optional[int] = None
+    embedded_texts: list = []
+
+    def embed_documents(self, texts, chunk_size=None):
+        self.embedded_texts.extend(texts)
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        self.embedded_texts.append(text)
+        return super().embed_query(text)
+
+    async def aembed_documents(self, texts, chunk_size=None):
+        await asyncio.sleep(0)
+        return self.embed_documents(texts)
+
+
+class FailingEmbeddings(CountingEmbeddings):
+    """Fails the batch containing `failing_text` while every other batch is still being embedded."""
+
+    failing_text: str = ""
+
+    async def aembed_documents(self, texts, chunk_size=None):
+        if self.failing_text in texts:
+            raise RuntimeError("embedding failed")
+        await asyncio.sleep(60)
+        return self.embed_documents(texts)
+
+
+class AsyncClientStub:
+    """Async facade over the test's in-memory client, standing in for AsyncQdrantClient."""
+
+    instances: list = []
+
+    def __init__(self, client):
+        self.client = client
+        self.closed = False
+        self.instances.append(self)
+
+    async def upsert(self, **kwargs):
+        return self.client.upsert(**kwargs)
+
+    async def close(self):
+        self.closed = True
+
+
+def _dataset(dataset_id, title):
+    return Dataset(
+        dataset_id=dataset_id,
+        titles=[title],
+        descriptions=[f"Beschreibung {title}"],
+        keywords=["test"],
+        access_urls=[],
+        download_urls=[],
+    )
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    manager = QdrantVectorStoreManager(collection_name="test_collection")
+    manager.embeddings = CountingEmbeddings(size=32, dimensions=32, embedded_texts=[])
+    # same steps as initialize(), against an in-process Qdrant instead of a server
+    manager.client = QdrantClient(":memory:")
+    manager._ensure_collection_exists()
+    manager.vector_store = QdrantVectorStore(
+        client=manager.client,
+        collection_name=manager.collection_name,
+        embedding=manager.embeddings,
+    )
+    manager.embeddings.embedded_texts.clear()
+    return manager
+
+
+@pytest.fixture
+def async_clients(manager, monkeypatch):
+    AsyncClientStub.instances = []
+    monkeypatch.setattr(qdrant_store, "AsyncQdrantClient", lambda **options: AsyncClientStub(manager.client))
+    return AsyncClientStub.instances
+
+
+def test_add_datasets_is_searchable(manager):
+    manager.add_datasets([_dataset(str(i), f"Datensatz {i}") for i in range(10)], batch_size=4)
+
+    assert manager.client.count(manager.collection_name).count == 10
+    results = manager.similarity_search("Title: Datensatz 3\nDescription: Beschreibung Datensatz 3\nKeywords: test", k=1)
+    assert results[0].metadata["dataset_id"] == "3"
+
+
+def test_add_datasets_consumes_a_generator_in_chunks(manager):
+    manager.add_datasets((_dataset(str(i), f"Datensatz {i}") for i in range(10)), batch_size=3)
+
+    assert manager.client.count(manager.collection_name).count == 10
+    assert len(manager.embeddings.embedded_texts) == 10
+
+
+def test_identical_texts_are_embedded_once(manager):
+    manager.add_datasets([_dataset("a", "Gleich"), _dataset("b", "Gleich"), _dataset("c", "Anders")])
+
+    assert len(manager.embeddings.embedded_texts) == 2
+    assert manager.client.count(manager.collection_name).count == 3
+
+
+def test_failed_upsert_is_raised(manager, monkeypatch):
+    def failing_upsert(**kwargs):
+        raise RuntimeError("upsert failed")
+
+    monkeypatch.setattr(manager.client, "upsert", failing_upsert)
+
+    with pytest.raises(RuntimeError, match="upsert failed"):
+        manager.add_datasets([_dataset(str(i), f"Datensatz {i}") for i in range(10)], batch_size=2)
+
+
+def test_add_datasets_async(manager, async_clients):
+    datasets = [_dataset(str(i), f"Datensatz {i}") for i in range(10)] + [_dataset("dup", "Datensatz 0")]
+    asyncio.run(manager.add_datasets_async(datasets, batch_size=3, max_concurrency=2))
+
+    assert manager.client.count(manager.collection_name).count == 11
+    assert len(manager.embeddings.embedded_texts) == 10
+    assert len(async_clients) == 1 and async_clients[0].closed
+
+
+def test_failed_async_batch_cancels_the_others(manager, async_clients):
+    manager.embeddings = FailingEmbeddings(size=32, dimensions=32, embedded_texts=[], failing_text=_dataset("0", "Datensatz 0").content)
+
+    with pytest.raises(RuntimeError, match="embedding failed"):
+        asyncio.run(asyncio.wait_for(manager.add_datasets_async([_dataset(str(i), f"Datensatz {i}") for i in range(10)], batch_size=2), timeout=10))
+
+    assert manager.embeddings.embedded_texts == []
+    assert manager.client.count(manager.collection_name).count == 0
+    assert async_clients[0].closed
+
+
+def test_adding_datasets_again_does_not_duplicate_points(manager):
+    datasets = [_dataset(str(i), f"Datensatz {i}") for i in range(10)]
+    manager.add_datasets(datasets)
+    manager.add_datasets(datasets)
+
+    assert manager.client.count(manager.collection_name).count == 10
+
+
+def test_point_id_is_stable():
+    assert point_id(_dataset("a", "Eins")) == point_id(_dataset("a", "Zwei"))
+    assert point_id(_dataset("a", "Eins")) != point_id(_dataset("b", "Eins"))
+    assert point_id(_dataset(None, "Eins")) == point_id(_dataset(None, "Eins"))
+    assert point_id(_dataset(None, "Eins")) != point_id(_dataset(None, "Zwei"))
+
+
+def test_collection_uses_configured_dimensions(manager):
+    vectors = manager.client.get_collection(manager.collection_name).config.params.vectors
+
+    assert vectors.size == 32
+
+
+def test_existing_collection_with_other_size_is_rejected(manager):
+    manager.embeddings = CountingEmbeddings(size=64, dimensions=64, embedded_texts=[])
+
+    with pytest.raises(ValueError, match="stores 32-dimensional vectors"):
+        manager._ensure_collection_exists()
+
+
+def test_existing_collection_with_matching_size_is_accepted(manager):
+    manager._ensure_collection_exists()
+
+    assert manager.client.get_collection(manager.collection_name).config.params.vectors.size == 32
+
+
+@pytest.mark.parametrize("model, dimensions, expected", [
+    ("text-embedding-3-large", None, 3072),
+    ("text-embedding-3-large", 256, 256),
+    ("text-embedding-ada-002", None, 1536),
+])
+def test_embedding_size_of_known_models_needs_no_request(manager, model, dimensions, expected):
+    manager.embeddings = CountingEmbeddings(size=32, model=model, dimensions=dimensions, embedded_texts=[])
+
+    assert manager._embedding_size() == expected
+    assert manager.embeddings.embedded_texts == []
+
+
+def test_embedding_size_of_unknown_model_is_probed(manager):
+    manager.embeddings = CountingEmbeddings(size=32, embedded_texts=[])
+
+    assert manager._embedding_size() == 32
+    assert manager.embeddings.embedded_texts == ["test"]
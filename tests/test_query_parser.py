@@ -0,0 +1,89 @@
+import pytest
+
+from parsers import query_parser
+from parsers.query_parser import Config, QueryIntent, QueryParser
+
+
+class FakeChain:
+    """Stands in for the prompt | model chain and records the queries it was invoked with."""
+
+    def __init__(self):
+        self.queries = []
+
+    def invoke(self, inputs):
+        self.queries.append(inputs["query"])
+        return QueryIntent(raw_theme=inputs["query"], locations=["Münster"])
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    query_parser._intent_cache.clear()
+    yield
+    query_parser._intent_cache.clear()
+
+
+def _parser(**config):
+    parser = QueryParser(Config(**config))
+    parser.chain = FakeChain()
+    return parser
+
+
+def test_repeated_query_is_answered_from_cache():
+    parser = _parser()
+
+    first = parser.parse("Radwege in Münster")
+    second = parser.parse("  radwege IN münster ")
+
+    assert parser.chain.queries == ["Radwege in Münster"]
+    assert second == first
+
+
+def test_cache_is_shared_between_parsers():
+    _parser().parse("Radwege in Münster")
+    parser = _parser()
+    parser.parse("Radwege in Münster")
+
+    assert parser.chain.queries == []
+
+
+def test_least_recently_used_intent_is_evicted(monkeypatch):
+    monkeypatch.setattr(query_parser, "INTENT_CACHE_SIZE", 2)
+    parser = _parser()
+
+    parser.parse("a")
+    parser.parse("b")
+    parser.parse("a")  # hit, makes "b" the least recently used entry
+    parser.parse("c")
+    parser.parse("a")
+    parser.parse("b")
+
+    assert parser.chain.queries == ["a", "b", "c", "b"]
+
+
+def test_cache_is_not_used_above_temperature_zero():
+    parser = _parser(temperature=0.7)
+
+    parser.parse("Radwege in Münster")
+    parser.parse("Radwege in Münster")
+
+    assert parser.chain.queries == ["Radwege in Münster", "Radwege in Münster"]
+    assert not query_parser._intent_cache
+
+
+def test_cache_can_be_disabled():
+    parser = _parser(use_cache=False)
+
+    parser.parse("Radwege in Münster")
+    parser.parse("Radwege in Münster")
+
+    assert len(parser.chain.queries) == 2
+    assert not query_parser._intent_cache
+
+
+def test_cache_key_depends_on_model():
+    _parser(model_name="gpt-4o-mini").parse("Radwege in Münster")
+    parser = _parser(model_name="gpt-4o")
+    parser.parse("Radwege in Münster")
+
+    assert parser.chain.queries == ["Radwege in Münster"]
@@ -0,0 +1,83 @@
+import shutil
+from pathlib import Path
+
+import pytest
+from rdflib import Graph
+
+from parsers.rdf_parser import RDFParser
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+def _as_comparable(datasets):
+    """Order-insensitive view of parsed datasets, since rdflib does not preserve statement order."""
+    return sorted(
+        (d.dataset_id or "", sorted(d.titles), sorted(d.descriptions), sorted(d.keywords), sorted(d.access_urls), sorted(d.download_urls))
+        for d in datasets
+    )
+
+
+def _parse_with_rdflib(parser, file_path):
+    # rdflib's own RDF/XML parser, as used before the streaming reader; Oxigraph's parser
+    # repeats namespace declarations in XML literals
+    graph = Graph()
+    graph.parse(str(file_path), format="xml")
+    return parser._extract_datasets(graph)
+
+
+@pytest.fixture
+def parser():
+    return RDFParser()
+
+
+def test_streaming_reads_rdfxml_constructs(parser):
+    datasets = {d.dataset_id: d for d in parser.parse_file(str(FIXTURES_DIR / "rdfxml_constructs.rdf"))}
+
+    assert set(datasets) == {"a", "b", "c"}
+
+    # statements about the same subject are merged across nodes
+    assert datasets["a"].titles == ("A",)
+    assert datasets["a"].descriptions == ("extra",)
+    assert datasets["a"].keywords == ("k1",)
+    # rdf:parseType="Resource" distribution
+    assert datasets["a"].access_urls == ("http://ex/a/access",)
+
+    # property attributes and rdf:type given as a property element
+    assert datasets["b"].titles == ("B-attr",)
+    assert datasets["b"].download_urls == ("http://ex/b/download",)
+
+    # property attributes on an empty property element
+    assert datasets["c"].access_urls == ("http://ex/c/access",)
+
+    # rdf:parseType="Literal" keeps the content as written
+    assert datasets["c"].titles == ("Radwege",)
+    assert datasets["c"].descriptions == ('Radwege <em xmlns="http://www.w3.org/1999/xhtml">in</em> Münster',)
+
+
+def test_streaming_matches_rdflib_on_fixture(parser):
+    file_path = FIXTURES_DIR / "rdfxml_constructs.rdf"
+    assert _as_comparable(parser.parse_file(str(file_path))) == _as_comparable(_parse_with_rdflib(parser, file_path))
+
+
+def test_file_without_extension_is_parsed_as_rdfxml(parser, tmp_path):
+    file_path = tmp_path / "catalog"
+    shutil.copy(FIXTURES_DIR / "rdfxml_constructs.rdf", file_path)
+
+    assert {d.dataset_id for d in parser.parse_file(str(file_path))} == {"a", "b", "c"}
+
+
+def test_streaming_matches_rdflib_on_bundled_catalog(parser):
+    file_path = DATA_DIR / "gdi_de_catalog.rdf"
+    streamed = list(parser.parse_file(str(file_path)))
+
+    assert len(streamed) == 100
+    assert _as_comparable(streamed) == _as_comparable(_parse_with_rdflib(parser, file_path))
+
+
+def test_graph_loader_extracts_datasets(parser):
+    graph = parser._load_graph(str(FIXTURES_DIR / "rdfxml_constructs.rdf"))
+    datasets = {d.dataset_id: d for d in parser._extract_datasets(graph)}
+
+    assert set(datasets) == {"a", "b", "c"}
+    assert datasets["b"].download_urls == ("http://ex/b/download",)
@@ -1,29 +1,72 @@
-from typing import List, Optional, Dict, Any
+import asyncio
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Optional, Dict, Any, Iterable
+from uuid import UUID
 from langchain_qdrant import QdrantVectorStore
-from qdrant_client import QdrantClient, models
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
 from langchain.schema import Document
 from langchain_openai import OpenAIEmbeddings
+from openai import RateLimitError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 from dotenv import load_dotenv
 from models.dataset import Dataset
 
 load_dotenv()
 
+EMBEDDING_BATCH_SIZE = 256
+EMBEDDING_CONCURRENCY = 8
+# number of embedded batches that may wait for their upsert while the next batch is embedded
+UPSERT_QUEUE_SIZE = 4
+# text-embedding-3 models are trained so that their vectors can be shortened; 1024 of the
+# 3072 dimensions of text-embedding-3-large keep nearly all of the retrieval quality.
+EMBEDDING_DIMENSIONS = 1024
+
+# native output sizes of the OpenAI embedding models, so creating a collection needs no probe request
+_MODEL_DIMS = {
+    "text-embedding-3-large": 3072,
+    "text-embedding-3-small": 1536,
+    "text-embedding-ada-002": 1536,
+}
+
+# Stored vectors are quantized to int8 and kept in RAM, while the full-precision originals live
+# on disk. Searches oversample on the quantized vectors and rescore the candidates with the originals.
+QUANTIZATION_CONFIG = models.ScalarQuantization(
+    scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+)
+SEARCH_PARAMS = models.SearchParams(
+    quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0)
+)
+
+def point_id(dataset: Dataset) -> str:
+    """
+    Derives a stable Qdrant point id from the dataset id, or from the content of datasets without one.
+
+    Indexing the same catalog again therefore overwrites the existing points instead of adding duplicates.
+    """
+    key = f"dataset\x00{dataset.dataset_id}" if dataset.dataset_id else f"content\x00{dataset.content}"
+    return str(UUID(bytes=hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()))
+
 class QdrantVectorStoreManager:
     """Manages Qdrant vector store operations."""
 
-    def __init__(self, host: str = "localhost", port: int = 6333, collection_name: str = "dcat_collection"):
+    def __init__(self, host: str = "localhost", port: int = 6333, collection_name: str = "dcat_collection", grpc_port: int = 6334, prefer_grpc: bool = True, embedding_dimensions: Optional[int] = EMBEDDING_DIMENSIONS):
         self.host = host
         self.port = port
+        self.grpc_port = grpc_port
+        self.prefer_grpc = prefer_grpc
         self.collection_name = collection_name
         self.client = None
         self.vector_store = None
-        self.embeddings = OpenAIEmbeddings(model="text-embedding-3-large")
+        self.embeddings = OpenAIEmbeddings(model="text-embedding-3-large", dimensions=embedding_dimensions)
 
     def initialize(self) -> None:
         """
         Initialiaze Qdrant client and vector store.
         """
-        self.client = QdrantClient(host=self.host, port=self.port)
+        self.client = QdrantClient(**self._connection_options())
         self._ensure_collection_exists()
 
         self.vector_store = QdrantVectorStore(
@@ -32,15 +75,86 @@ class QdrantVectorStoreManager:
             embedding=self.embeddings,
         )
 
-    def add_datasets(self, datasets: List[Dataset]) -> None:
+    def add_datasets(self, datasets: Iterable[Dataset], batch_size: int = EMBEDDING_BATCH_SIZE) -> None:
         """
         Adds datasets to the vector store.
+
+        Datasets are consumed in chunks of `batch_size`, so a generator such as
+        RDFParser.parse_file() is never materialized as a whole. Identical texts within a
+        chunk are embedded only once, with one OpenAI request per chunk, and the points of
+        each chunk are upserted by a background thread while the next chunk is embedded.
+        At most `UPSERT_QUEUE_SIZE` chunks wait for their upsert at a time. Upserts run in
+        order and only the last one waits until it is applied; since Qdrant applies a
+        collection's updates in order, all points are searchable once this method returns.
         """
         if not self.vector_store:
             raise ValueError("Vector store is not initialized. Call initialize() first.")
-        
-        documents = self._datasets_to_documents(datasets)
-        self.vector_store.add_documents(documents)
+
+        datasets = iter(datasets)
+        chunks = iter(lambda: list(islice(datasets, batch_size)), [])
+        with ThreadPoolExecutor(max_workers=1) as upserter:
+            pending = deque()
+            chunk = next(chunks, None)
+            while chunk is not None:
+                next_chunk = next(chunks, None)
+                texts, metadatas, ids = self._datasets_to_documents(chunk)
+                groups = self._group_duplicates(texts)
+                vectors = self.embeddings.embed_documents([texts[group[0]] for group in groups], chunk_size=batch_size)
+                points = self._build_group_points(texts, metadatas, ids, groups, vectors)
+                pending.append(upserter.submit(self.client.upsert, collection_name=self.collection_name, points=points, wait=next_chunk is None))
+                while len(pending) > UPSERT_QUEUE_SIZE:
+                    pending.popleft().result()
+                chunk = next_chunk
+            for upsert in pending:
+                upsert.result()
+
+    async def add_datasets_async(self, datasets: Iterable[Dataset], batch_size: int = EMBEDDING_BATCH_SIZE, max_concurrency: int = EMBEDDING_CONCURRENCY) -> None:
+        """
+        Adds datasets to the vector store, embedding up to `max_concurrency` batches concurrently.
+
+        Identical texts are embedded only once. Each batch is upserted through an async
+        Qdrant client, opened for the duration of the call, as soon as its embeddings are
+        available. If a batch fails, the remaining batches are cancelled and the error is raised.
+        """
+        if not self.vector_store:
+            raise ValueError("Vector store is not initialized. Call initialize() first.")
+
+        texts, metadatas, ids = self._datasets_to_documents(datasets)
+        groups = self._group_duplicates(texts)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        async_client = AsyncQdrantClient(**self._connection_options())
+
+        async def embed_and_upsert(batch: List[List[int]]) -> None:
+            async with semaphore:
+                vectors = await self._aembed_batch([texts[group[0]] for group in batch])
+            points = self._build_group_points(texts, metadatas, ids, batch, vectors)
+            await async_client.upsert(collection_name=self.collection_name, points=points, wait=True)
+
+        tasks = [
+            asyncio.create_task(embed_and_upsert(groups[start:start + batch_size]))
+            for start in range(0, len(groups), batch_size)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            await async_client.close()
+
+    @retry(
+        retry=retry_if_exception_type(RateLimitError),
+        wait=wait_random_exponential(min=1, max=60),
+        stop=stop_after_attempt(6),
+        reraise=True,
+    )
+    async def _aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds a single batch of texts, backing off exponentially on OpenAI rate limit errors.
+        """
+        return await self.embeddings.aembed_documents(texts, chunk_size=len(texts))
 
     def similarity_search(self, query: str, k:int = 3, filter_criteria: Optional[models.Filter] = None) -> List[Document]:
         """
@@ -56,8 +170,8 @@ class QdrantVectorStoreManager:
             raise ValueError("Vector store is not initialized")
         
         if filter_criteria:
-            return self.vector_store.similarity_search(query, k=k, filter=filter_criteria)
-        return self.vector_store.similarity_search(query, k=k)
+            return self.vector_store.similarity_search(query, k=k, filter=filter_criteria, search_params=SEARCH_PARAMS)
+        return self.vector_store.similarity_search(query, k=k, search_params=SEARCH_PARAMS)
 
     def similarity_search_with_score(self,  query: str, k: int = 3, filter_criteria: Optional[models.Filter] = None) -> List[tuple[Document, float]]:
         """
@@ -69,32 +183,110 @@ class QdrantVectorStoreManager:
             raise ValueError("Vector store is not initialized")
         
         if filter_criteria:
-            return self.vector_store.similarity_search_with_score(query, k=k, filter=filter_criteria)
-        return self.vector_store.similarity_search_with_score(query, k=k)
+            return self.vector_store.similarity_search_with_score(query, k=k, filter=filter_criteria, search_params=SEARCH_PARAMS)
+        return self.vector_store.similarity_search_with_score(query, k=k, search_params=SEARCH_PARAMS)
+
+    def _connection_options(self) -> Dict[str, Any]:
+        """
+        Connection settings shared by the sync and async Qdrant clients. With `prefer_grpc`,
+        points are sent as binary protobuf over gRPC instead of JSON over REST.
+        """
+        return {
+            "host": self.host,
+            "port": self.port,
+            "grpc_port": self.grpc_port,
+            "prefer_grpc": self.prefer_grpc,
+        }
 
     def _ensure_collection_exists(self) -> None:
         """
-        Create a Qdrant collection if it does not exist.
+        Create a Qdrant collection if it does not exist, or check that the existing one
+        stores vectors of the embedding model's size.
         """
-        if not self.client.collection_exists(collection_name=self.collection_name):
-            test_embedding = self.embeddings.embed_query("test") # example embedding to determine size
+        size = self._embedding_size()
+        if self.client.collection_exists(collection_name=self.collection_name):
+            vectors = self.client.get_collection(self.collection_name).config.params.vectors
+            if isinstance(vectors, models.VectorParams) and vectors.size != size:
+                raise ValueError(
+                    f"Collection '{self.collection_name}' stores {vectors.size}-dimensional vectors, "
+                    f"but the embedding model produces {size} dimensions. Delete and recreate the "
+                    "collection, or set embedding_dimensions to match it."
+                )
+        else:
             self.client.create_collection(
                 collection_name=self.collection_name,
-                vectors_config={
-                    "size": len(test_embedding),
-                    "distance": "Cosine",
-                },
+                vectors_config=models.VectorParams(
+                    size=size,
+                    distance=models.Distance.COSINE,
+                    on_disk=True,
+                ),
+                quantization_config=QUANTIZATION_CONFIG,
             )
 
-    def _datasets_to_documents(self, datasets: List[Dataset]) -> List[Document]:
+    def _embedding_size(self) -> int:
+        """
+        Returns the vector size produced by the embedding model.
+
+        The configured or known model dimension is used when available; only unknown
+        models are probed with an example embedding.
+        """
+        size = self.embeddings.dimensions or _MODEL_DIMS.get(self.embeddings.model)
+        if size is None:
+            size = len(self.embeddings.embed_query("test"))
+        return size
+
+    def _datasets_to_documents(self, datasets: Iterable[Dataset]) -> tuple[List[str], List[Dict[str, Any]], List[str]]:
         """
-        Converts a list of Dataset objects to a list of langchain Document objects.
+        Converts a list of Dataset objects to parallel lists of page contents, metadata and point ids.
         """
-        documents = []
+        texts = []
+        metadatas = []
+        ids = []
         for dataset in datasets:
-            document = Document(
-                page_content=dataset.to_content(),
-                metadata=dataset.to_metadata()
+            texts.append(dataset.content)
+            metadatas.append(dataset.to_metadata())
+            ids.append(point_id(dataset))
+        return texts, metadatas, ids
+
+    @staticmethod
+    def _group_duplicates(texts: List[str]) -> List[List[int]]:
+        """
+        Groups the positions of byte-identical texts, in order of first occurrence,
+        so that each distinct text only needs to be embedded once.
+        """
+        # str objects cache their hash, so keying on the text itself is cheaper than
+        # encoding and digesting every text, and cannot collide
+        groups: Dict[str, List[int]] = {}
+        for position, text in enumerate(texts):
+            groups.setdefault(text, []).append(position)
+        return list(groups.values())
+
+    def _build_group_points(self, texts: List[str], metadatas: List[Dict[str, Any]], ids: List[str], groups: List[List[int]], vectors: List[List[float]]) -> List[models.PointStruct]:
+        """
+        Builds the points for a batch of duplicate groups, sharing each group's vector between its members.
+        """
+        positions = [position for group in groups for position in group]
+        shared_vectors = [vector for group, vector in zip(groups, vectors) for _ in group]
+        return self._build_points(
+            [texts[position] for position in positions],
+            [metadatas[position] for position in positions],
+            [ids[position] for position in positions],
+            shared_vectors,
+        )
+
+    def _build_points(self, texts: List[str], metadatas: List[Dict[str, Any]], ids: List[str], vectors: List[List[float]]) -> List[models.PointStruct]:
+        """
+        Builds Qdrant points using the same payload layout as langchain's QdrantVectorStore,
+        so that documents remain retrievable through the similarity search methods.
+        """
+        return [
+            models.PointStruct(
+                id=id_,
+                vector=vector,
+                payload={
+                    QdrantVectorStore.CONTENT_KEY: text,
+                    QdrantVectorStore.METADATA_KEY: metadata,
+                },
             )
-            documents.append(document)
-        return documents
\ No newline at end of file
+            for text, metadata, id_, vector in zip(texts, metadatas, ids, vectors)
+        ]
\ No newline at end of file